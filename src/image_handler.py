@@ -3,6 +3,7 @@ from pathlib import Path
 import base64
 import time
 import asyncio
+import threading
 from PIL import Image
 from together import Together
 import io
@@ -12,7 +13,6 @@ class ImageHandler:
         self.together_client = Together()
         self.last_request_time = 0
         self.RATE_LIMIT_DELAY = 10  # 10 seconds between requests
-        self.BATCH_SIZE = 3  # Process images in batches of 3
         
         # Define video format specifications
         self.VIDEO_FORMATS = {
@@ -35,8 +35,33 @@ class ImageHandler:
         self.WIDTH = None
         self.HEIGHT = None
         
-        # Create image processing semaphore
-        self.semaphore = asyncio.Semaphore(3)  # Limit concurrent API calls
+        # Limit concurrent API calls. A thread semaphore, because the handler is
+        # shared by requests running on different event loops (see app.py)
+        self.semaphore = threading.BoundedSemaphore(3)
+        
+        # Serializes the rate-limit check so concurrent requests are spaced out
+        self._rate_limit_lock = threading.Lock()
+
+    def _request_image(self, prompt: str, width: int, height: int):
+        """Blocking Together API call; run in a worker thread"""
+        with self.semaphore:
+            # Rate limiting: stamp the start time before sending, so the next
+            # request waits even while this one is still in flight
+            with self._rate_limit_lock:
+                elapsed = time.time() - self.last_request_time
+                if elapsed < self.RATE_LIMIT_DELAY:
+                    time.sleep(self.RATE_LIMIT_DELAY - elapsed)
+                self.last_request_time = time.time()
+            
+            return self.together_client.images.generate(
+                prompt=prompt,
+                model="black-forest-labs/FLUX.1-schnell-Free",
+                width=width,
+                height=height,
+                steps=4,
+                n=1,
+                response_format="b64_json"
+            )
 
     async def generate_image(
         self,
@@ -46,52 +71,38 @@ class ImageHandler:
         output_dir: str = None
     ) -> str:
         """Generate an image and save it to file"""
-        async with self.semaphore:  # Control concurrent API calls
-            try:
-                # Rate limiting
-                current_time = time.time()
-                if current_time - self.last_request_time < self.RATE_LIMIT_DELAY:
-                    await asyncio.sleep(self.RATE_LIMIT_DELAY - (current_time - self.last_request_time))
-                
-                # Calculate dimensions based on format
-                width_steps = 64  # Base step size
-                height_steps = 64
-                
-                if self.current_format == "shorts":
-                    width = 9 * width_steps   # 576 pixels (9:16 ratio)
-                    height = 16 * height_steps # 1024 pixels
-                else:
-                    width = 16 * width_steps  # 1024 pixels (16:9 ratio)
-                    height = 9 * height_steps  # 576 pixels
-                
-                print(f"Generating {self.current_format} format image {index + 1}/{length}")
-                
-                response = self.together_client.images.generate(
-                    prompt=prompt,
-                    model="black-forest-labs/FLUX.1-schnell-Free",
-                    width=width,
-                    height=height,
-                    steps=4,
-                    n=1,
-                    response_format="b64_json"
+        try:
+            # Calculate dimensions based on format
+            width_steps = 64  # Base step size
+            height_steps = 64
+            
+            if self.current_format == "shorts":
+                width = 9 * width_steps   # 576 pixels (9:16 ratio)
+                height = 16 * height_steps # 1024 pixels
+            else:
+                width = 16 * width_steps  # 1024 pixels (16:9 ratio)
+                height = 9 * height_steps  # 576 pixels
+            
+            print(f"Generating {self.current_format} format image {index + 1}/{length}")
+            
+            # The SDK call is blocking; keep it off the event loop so the other
+            # images' requests run concurrently
+            response = await asyncio.to_thread(self._request_image, prompt, width, height)
+            
+            # Process and save the image
+            if response and hasattr(response, 'data') and len(response.data) > 0:
+                return await self._process_and_save_image(
+                    response.data[0].b64_json,
+                    index,
+                    output_dir
                 )
-                
-                self.last_request_time = time.time()
-                
-                # Process and save the image
-                if response and hasattr(response, 'data') and len(response.data) > 0:
-                    return await self._process_and_save_image(
-                        response.data[0].b64_json,
-                        index,
-                        output_dir
-                    )
-                else:
-                    print(f"Error: Invalid response format from Together AI")
-                    return None
-                
-            except Exception as e:
-                print(f"Error generating image: {str(e)}")
+            else:
+                print(f"Error: Invalid response format from Together AI")
                 return None
+            
+        except Exception as e:
+            print(f"Error generating image: {str(e)}")
+            return None
 
     async def _process_and_save_image(self, b64_json: str, index: int, output_dir: str = None) -> str:
         """Process and save image from base64 data"""
@@ -124,27 +135,18 @@ class ImageHandler:
             return None
 
     async def generate_images(self, prompts: list[str], output_dir: str = None) -> list[str]:
-        """Generate all images in parallel batches"""
-        image_paths = []
-        
-        # Process prompts in batches
-        for i in range(0, len(prompts), self.BATCH_SIZE):
-            batch_prompts = prompts[i:i + self.BATCH_SIZE]
-            batch_tasks = [
-                self.generate_image(
-                    prompt,
-                    i + idx,
-                    len(prompts),
-                    output_dir
-                )
-                for idx, prompt in enumerate(batch_prompts)
-            ]
-            
-            # Process batch in parallel
-            batch_results = await asyncio.gather(*batch_tasks)
-            image_paths.extend([path for path in batch_results if path])
+        """Generate all images concurrently, bounded by the API semaphore"""
+        results = await asyncio.gather(*[
+            self.generate_image(
+                prompt,
+                idx,
+                len(prompts),
+                output_dir
+            )
+            for idx, prompt in enumerate(prompts)
+        ])
         
-        return image_paths
+        return [path for path in results if path]
 
     def set_format(self, format_type: str):
         """Set the video format (shorts or normal)"""
@@ -4,35 +4,171 @@ import math
 import asyncio
 import traceback
 import numpy as np
-from PIL import Image
+import cv2
+from PIL import Image, ImageFilter
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
+from functools import lru_cache
 
-import numpy as np
 from moviepy.editor import *
 from moviepy.video.tools.subtitles import SubtitlesClip
 from moviepy.video.VideoClip import ColorClip, TextClip
 
 from moviepy.editor import AudioFileClip, TextClip, CompositeVideoClip, ImageClip, ColorClip, vfx, VideoClip, VideoFileClip
-from moviepy.config import change_settings
+from moviepy.config import change_settings, get_setting
 import re
-import speech_recognition as sr
 import openai
 import time
-from together import Together
 from proglog import ProgressBarLogger
 from difflib import SequenceMatcher
 import tempfile
-import whisper
-import torch
-from pydub import AudioSegment
+import random
+import subprocess
+import platform
+import threading
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import ssl
 ssl._create_default_https_context = ssl._create_unverified_context
-import edge_tts
-import librosa
-import scipy.signal
+import soundfile as sf
 import base64
-import io
+import hashlib
+
+logger = logging.getLogger(__name__)
+
+# Optional: C-accelerated string similarity, difflib is used when missing
+try:
+    from rapidfuzz import fuzz
+    from rapidfuzz.process import cdist
+except ImportError:
+    fuzz = None
+    cdist = None
+
+# Optional: SIMD block RMS, the NumPy path in _fast_rms is used when missing
+try:
+    import numpy_rms
+except ImportError:
+    numpy_rms = None
+
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
+# Optional: JIT-compiled kernels, imported and compiled on first use (see
+# _numba_kernels). cv2.resize + slicing and plain Python are used when missing
+prange = range  # numba.prange once the kernels are compiled
+
+# Patterns reused on every word / phrase
+_CLEAN_TEXT_RE = re.compile(r'[^\w\s]')
+_PUNCT = frozenset('.!?,;:')
+_PUNCT_RE = re.compile(r'\s+([.,!?;:])')
+
+def _fast_rms(y: np.ndarray, frame: int = 2048, hop: int = 512) -> np.ndarray:
+    """Frame-wise RMS straight from the time-domain signal (no STFT)"""
+    # Centre frames like librosa so frame i sits at time i * hop / sr
+    y = np.pad(y, frame // 2)
+    if numpy_rms is not None and frame % hop == 0:
+        # numpy_rms works on non-overlapping windows: take RMS over hop-sized
+        # blocks, then average the power of frame // hop consecutive blocks
+        y = np.ascontiguousarray(y[:len(y) - len(y) % hop], dtype=np.float32)
+        block_power = np.square(numpy_rms.rms(y, window_size=hop), dtype=np.float32)
+        blocks_per_frame = frame // hop
+        kernel = np.full(blocks_per_frame, 1.0 / blocks_per_frame, dtype=np.float32)
+        return np.sqrt(np.convolve(block_power, kernel, mode='valid'))
+    frames = np.lib.stride_tricks.sliding_window_view(y, frame)[::hop]
+    return np.sqrt(np.square(frames, dtype=np.float32).mean(axis=1))
+
+def _adjust_gaps(starts, ends, durations, min_duration):
+    """The _adjust_timing_gaps rules over start/end/duration arrays, in place.
+    Segments are handled in order: the gap is measured against the previous
+    segment as already adjusted, then the minimum duration is applied"""
+    for i in range(len(starts)):
+        if i > 0:
+            gap = starts[i] - ends[i - 1]
+            
+            if gap > 0.3:  # If gap is too large
+                # Extend previous segment and start current one earlier
+                gap_adjustment = gap * 0.4  # Reduce gap by 40%
+                ends[i - 1] += gap_adjustment / 2
+                starts[i] -= gap_adjustment / 2
+            elif gap < 0:  # If segments overlap
+                # Find middle point and adjust both segments
+                middle = (starts[i] + ends[i - 1]) / 2
+                ends[i - 1] = middle
+                starts[i] = middle
+        
+        # Ensure minimum duration
+        if ends[i] - starts[i] < min_duration:
+            ends[i] = starts[i] + min_duration
+        
+        # Duration is fixed here: a later gap fix moves this segment's end
+        # but not how long its subtitle is shown
+        durations[i] = ends[i] - starts[i]
+
+def _zoom_crop(frame, new_w, new_h, x1, y1, out_w, out_h):
+    """Bilinear-resample frame to (new_w, new_h) and return the
+    (out_w, out_h) window at (x1, y1), without the full-size intermediate"""
+    src_h, src_w = frame.shape[0], frame.shape[1]
+    scale_x = src_w / new_w
+    scale_y = src_h / new_h
+    out = np.empty((out_h, out_w, 3), dtype=np.uint8)
+    for oy in prange(out_h):
+        sy = (oy + y1 + 0.5) * scale_y - 0.5
+        sy = min(max(sy, 0.0), src_h - 1.0)
+        y0 = int(sy)
+        y1_ = min(y0 + 1, src_h - 1)
+        fy = sy - y0
+        for ox in range(out_w):
+            sx = (ox + x1 + 0.5) * scale_x - 0.5
+            sx = min(max(sx, 0.0), src_w - 1.0)
+            x0 = int(sx)
+            x1_ = min(x0 + 1, src_w - 1)
+            fx = sx - x0
+            for c in range(3):
+                top = frame[y0, x0, c] * (1.0 - fx) + frame[y0, x1_, c] * fx
+                bottom = frame[y1_, x0, c] * (1.0 - fx) + frame[y1_, x1_, c] * fx
+                out[oy, ox, c] = np.uint8(top * (1.0 - fy) + bottom * fy + 0.5)
+    return out
+
+@lru_cache(maxsize=None)
+def _numba_kernels() -> Optional[tuple]:
+    """JIT wrappers (zoom_crop, adjust_gaps), or None when numba is missing.
+    numba is imported on the first call and each kernel is compiled (or loaded
+    from the on-disk cache) on its own first call"""
+    global prange
+    try:
+        import numba
+    except ImportError:
+        return None
+    prange = numba.prange  # read from globals when _zoom_crop is compiled
+    return (
+        numba.njit(cache=True, parallel=True, nogil=True)(_zoom_crop),
+        numba.njit(cache=True, nogil=True)(_adjust_gaps),
+    )
+
+@lru_cache(maxsize=8192)
+def _clean_text_cached(text: str) -> str:
+    """Lower-case and strip punctuation for word comparison (memoized)"""
+    return _CLEAN_TEXT_RE.sub('', text.lower().strip())
+
+@lru_cache(maxsize=64)
+def _split_into_phrases_cached(text: str) -> tuple:
+    """Split text into phrases ending at punctuation (memoized, immutable)"""
+    # Single pass: every punctuation mark closes the phrase before it,
+    # whitespace is normalized per phrase
+    phrases = []
+    phrase_start = 0
+    for i, ch in enumerate(text):
+        if ch in _PUNCT:
+            phrases.append(' '.join(text[phrase_start:i + 1].split()))
+            phrase_start = i + 1
+    
+    # Add any remaining phrase
+    tail = ' '.join(text[phrase_start:].split())
+    if tail:
+        phrases.append(tail)
+    
+    return tuple(phrases)
 
 class MyBarLogger(ProgressBarLogger):
     def __init__(self, progress_callback=None):
@@ -83,16 +219,111 @@ class VideoGenerator:
             change_settings({"IMAGEMAGICK_BINARY": "/usr/bin/convert"})
 
 
-        # Patch MoviePy's resize function to use Lanczos
+        # Resizes go through OpenCV; PIL still does the title glow blur and
+        # image encoding, which Pillow-SIMD (versions like "9.5.0.post1") speeds up
+        if 'post' not in Image.__version__:
+            logger.info("Pillow %s detected; install pillow-simd for SIMD PIL filters", Image.__version__)
+
+        # Patch MoviePy's resize function to use OpenCV area/Lanczos
         self._patch_moviepy_resize()
 
+        # Hand frames to ffmpeg from a writer thread so rendering overlaps encoding
+        self._patch_moviepy_writer()
+
         # Ensure output directories exist
         os.makedirs(self.DEFAULT_VIDEO_DIR, exist_ok=True)
         os.makedirs(self.DEFAULT_THUMBNAIL_DIR, exist_ok=True)
         os.makedirs(self.DEFAULT_TEMP_DIR, exist_ok=True)
 
+        # Background effects rendered by _render_ffmpeg_transition
+        self.TRANSITION_EFFECTS = ['static', 'zoom_in', 'zoom_out', 'pan_right', 'pan_left']
+        # Slow zooms/pans are sampled at half the output rate and each frame is held
+        self.BACKGROUND_FPS = 15
+
+        # Final H.264 encoder: hardware when available, libx264 otherwise
+        self._h264_codec = self._detect_h264_encoder()
+
+        # Burn subtitles in with ffmpeg's libass when the build has it
+        self._ass_supported = self._ffmpeg_has_filter('ass')
+
+        # Decoded audio keyed by (path, mtime) so analysis passes share one decode
+        self._audio_cache: dict[tuple, tuple] = {}
+        self.AUDIO_CACHE_SIZE = 4
+
+        # Whisper-detected language keyed by a hash of the audio's leading bytes
+        self._language_cache: dict[str, str] = {}
+        self.LANGUAGE_CACHE_SIZE = 32
+
+        # Whisper model, loaded on first transcription and reused afterwards.
+        # Generations run on separate threads with their own event loops, so
+        # the load is guarded by a thread lock rather than an asyncio.Lock
+        self._whisper_model = None
+        self._whisper_load_lock = threading.Lock()
+        self._whisper_lock = threading.Lock()  # one inference at a time per model
+
+        # Translucent text backgrounds keyed by (width, height, color, opacity)
+        self._text_bg_cache: dict[tuple, ImageClip] = {}
+
+    def _get_text_background(self, width: int, height: int, color: tuple, opacity: float) -> ImageClip:
+        """Return a shared translucent RGBA background clip of the given size"""
+        key = (width, height, color, opacity)
+        bg = self._text_bg_cache.get(key)
+        if bg is None:
+            # One RGBA fill; the alpha channel becomes the mask, so no
+            # separate opacity mask clip is needed
+            bg_array = np.empty((height, width, 4), dtype=np.uint8)
+            bg_array[...] = (*color, round(opacity * 255))
+            bg = ImageClip(bg_array)
+            self._text_bg_cache[key] = bg
+        # set_* returns a shallow copy, so every caller shares the same arrays
+        return bg
+
+    def _detect_h264_encoder(self) -> str:
+        """Pick a hardware H.264 encoder that actually works on this machine"""
+        if platform.system() == "Darwin":
+            candidates = ['h264_videotoolbox']
+        else:
+            candidates = ['h264_nvenc', 'h264_amf']
+        
+        for codec in candidates:
+            try:
+                # Being listed by ffmpeg doesn't mean the GPU/driver is present,
+                # so run a tiny trial encode
+                result = subprocess.run(
+                    [
+                        get_setting("FFMPEG_BINARY"), '-hide_banner', '-loglevel', 'error',
+                        '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+                        '-c:v', codec, '-pix_fmt', 'yuv420p', '-f', 'null', '-'
+                    ],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=15
+                )
+                if result.returncode == 0:
+                    print(f"Using hardware encoder: {codec}")
+                    return codec
+            except Exception as e:
+                print(f"Encoder probe for {codec} failed: {str(e)}")
+        
+        return 'libx264'
+
+    def _ffmpeg_has_filter(self, name: str) -> bool:
+        """Check whether MoviePy's ffmpeg binary was built with a given filter"""
+        try:
+            result = subprocess.run(
+                [get_setting("FFMPEG_BINARY"), '-hide_banner', '-filters'],
+                capture_output=True,
+                text=True,
+                timeout=15
+            )
+            # Lines look like " ... ass               V->V       Render ASS subtitles..."
+            return any(line.split()[1:2] == [name] for line in result.stdout.splitlines())
+        except Exception as e:
+            print(f"Could not list ffmpeg filters: {str(e)}")
+            return False
+
     def _patch_moviepy_resize(self):
-        """Patch MoviePy's resize function to use Lanczos instead of ANTIALIAS"""
+        """Patch MoviePy's resize function to use OpenCV instead of ANTIALIAS"""
         from moviepy.video.fx.resize import resize
         from functools import wraps
 
@@ -113,8 +344,10 @@ class VideoGenerator:
                 frame = get_frame(t)
                 if frame.shape[0:2] == (h, w):
                     return frame
-                resized = np.array(Image.fromarray(frame).resize((w, h), Image.Resampling.LANCZOS))
-                return resized
+                # Area averaging for downscales, Lanczos for upscales
+                downscale = w * h < frame.shape[1] * frame.shape[0]
+                interpolation = cv2.INTER_AREA if downscale else cv2.INTER_LANCZOS4
+                return cv2.resize(frame, (w, h), interpolation=interpolation)
 
             new_clip = clip.transform(transform_frame, apply_to_mask=apply_to_mask)
             new_clip.w = w
@@ -125,44 +358,61 @@ class VideoGenerator:
         import moviepy.video.fx.resize
         moviepy.video.fx.resize.resize = new_resize
 
+    def _patch_moviepy_writer(self):
+        """Patch MoviePy's ffmpeg writer to pipe frames from a background thread"""
+        from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+
+        if getattr(FFMPEG_VideoWriter, '_queued_writer', False):
+            return
+        original_write_frame = FFMPEG_VideoWriter.write_frame
+        original_close = FFMPEG_VideoWriter.close
+
+        def write_frame(writer, img_array):
+            frame_queue = writer.__dict__.get('_frame_queue')
+            if frame_queue is None:
+                # Bounded so rendering can only run a few frames ahead of ffmpeg
+                frame_queue = queue.Queue(maxsize=8)
+                writer._frame_queue = frame_queue
+                writer._frame_error = None
+
+                def consume():
+                    while True:
+                        frame = frame_queue.get()
+                        if frame is None:
+                            return
+                        if writer._frame_error is None:
+                            try:
+                                original_write_frame(writer, frame)
+                            except Exception as e:
+                                writer._frame_error = e
+
+                writer._frame_thread = threading.Thread(target=consume, daemon=True)
+                writer._frame_thread.start()
+
+            # Surface ffmpeg failures on the rendering thread
+            if writer._frame_error is not None:
+                raise writer._frame_error
+            frame_queue.put(img_array)
+
+        def close(writer):
+            frame_queue = writer.__dict__.get('_frame_queue')
+            if frame_queue is not None:
+                # Drain the remaining frames before closing ffmpeg's stdin
+                frame_queue.put(None)
+                writer._frame_thread.join()
+                writer._frame_queue = None
+            original_close(writer)
+            error = writer.__dict__.pop('_frame_error', None)
+            if error is not None:
+                raise error
+
+        FFMPEG_VideoWriter.write_frame = write_frame
+        FFMPEG_VideoWriter.close = close
+        FFMPEG_VideoWriter._queued_writer = True
+
     def split_into_phrases(self, text: str) -> list[str]:
         """Split text into natural phrases using punctuation"""
-        # Split on punctuation but keep the punctuation marks
-        import re
-        
-        # Define punctuation pattern
-        pattern = r'([.!?,;:])'
-        
-        # Split text into sentences first
-        sentences = re.split(pattern, text)
-        
-        # Clean up and combine punctuation with phrases
-        phrases = []
-        current_phrase = ""
-        
-        for item in sentences:
-            if not item.strip():
-                continue
-            
-            if re.match(pattern, item):
-                # This is punctuation, add it to current phrase
-                current_phrase += item
-                phrases.append(current_phrase.strip())
-                current_phrase = ""
-            else:
-                # This is text, start new phrase
-                if current_phrase:
-                    phrases.append(current_phrase.strip())
-                current_phrase = item
-        
-        # Add any remaining phrase
-        if current_phrase:
-            phrases.append(current_phrase.strip())
-        
-        # Filter out empty phrases and normalize whitespace
-        phrases = [' '.join(phrase.split()) for phrase in phrases if phrase.strip()]
-        
-        return phrases
+        return list(_split_into_phrases_cached(text))
 
     def create_text_clip(self, text: str, start_time: float, duration: float, is_silence: bool = False) -> TextClip:
         """Create text clip with karaoke effect"""
@@ -191,11 +441,8 @@ class VideoGenerator:
             bg_width = txt_clip.w + (padding * 2)
             bg_height = txt_clip.h + (padding * 2)
             
-            # Create background clip with opacity
-            bg_clip = ColorClip(
-                size=(bg_width, bg_height),
-                color=(0, 0, 0)
-            ).set_opacity(0.7)
+            # Background with opacity, shared between subtitles of the same size
+            bg_clip = self._get_text_background(bg_width, bg_height, (0, 0, 0), 0.7)
             
             # Compose text and background
             txt_clip = txt_clip.set_position((padding, padding))  # Center text in background
@@ -204,6 +451,12 @@ class VideoGenerator:
                 size=(bg_width, bg_height)
             )
             
+            # The subtitle is static, so flatten the two layers once into a
+            # single image + mask instead of compositing them on every frame
+            composed_clip = ImageClip(composed_clip.get_frame(0)).set_mask(
+                ImageClip(composed_clip.mask.get_frame(0), ismask=True)
+            )
+            
             # Position at the bottom with padding
             bottom_padding = self.HEIGHT * 0.15  # 15% from bottom
             composed_clip = composed_clip.set_position(('center', self.HEIGHT - bottom_padding - bg_height))
@@ -220,19 +473,75 @@ class VideoGenerator:
             return composed_clip
             
         except Exception as e:
-            print(f"Error creating text clip: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error creating text clip: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
 
-    def _apply_random_transitions(self, clip, duration):
-        """Apply random transitions to a clip"""
+    def _write_ass(self, phrase_timings: list[dict], path: str):
+        """Write phrase timings as an ASS subtitle file styled like create_text_clip"""
+        def ass_time(seconds):
+            cs = int(round(max(0.0, seconds) * 100))
+            return f"{cs // 360000}:{cs // 6000 % 60:02d}:{cs // 100 % 60:02d}.{cs % 100:02d}"
+
+        fontsize = 62 if self.current_format == "shorts" else 50
+        side_margin = int(self.WIDTH * 0.15)  # text wraps at 70% of the width
+        padding = 20  # box padding around the text, as in create_text_clip
+        bottom_margin = int(self.HEIGHT * 0.15) + padding  # 15% from bottom plus padding
+
+        lines = [
+            "[Script Info]",
+            "ScriptType: v4.00+",
+            f"PlayResX: {self.WIDTH}",
+            f"PlayResY: {self.HEIGHT}",
+            "WrapStyle: 0",
+            "ScaledBorderAndShadow: yes",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+            "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, "
+            "Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+            # Yellow text (&HAABBGGRR), bottom centre, on an opaque box
+            # (BorderStyle 3): libass fills it with OutlineColour, here 70%
+            # black, and pads it by Outline, the 20px of create_text_clip
+            f"Style: Default,Arial,{fontsize},&H0000FFFF,&H0000FFFF,&H4D000000,&H4D000000,"
+            f"-1,0,0,0,100,100,0,0,3,{padding},0,2,{side_margin},{side_margin},{bottom_margin},1",
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+        ]
+        for timing in phrase_timings:
+            text = timing['word'].strip()
+            if not text:
+                continue
+            text = text.replace('{', '(').replace('}', ')').replace('\n', '\\N')
+            # Same fade as create_text_clip: 15% of duration or 0.3s, whichever is shorter
+            fade_ms = int(min(0.3, timing['duration'] * 0.15) * 1000)
+            start = timing['start']
+            end = start + timing['duration']
+            lines.append(
+                f"Dialogue: 0,{ass_time(start)},{ass_time(end)},Default,,0,0,0,,"
+                f"{{\\fad({fade_ms},{fade_ms})}}{text}"
+            )
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def _make_ease_in_out(self, duration: float, fps: int = 30):
+        """Smoothstep over the clip duration, precomputed once per output frame"""
+        n = int(duration * fps) + 1
+        progress = np.minimum(np.arange(n) / (duration * fps), 1.0)
+        eased = (progress * progress * (3 - 2 * progress)).tolist()
+        
+        def ease_in_out(t):
+            return eased[min(n - 1, max(0, round(t * fps)))]
+        
+        return ease_in_out
+
+    def _apply_random_transitions(self, frame, duration):
+        """Apply random transitions to a background frame"""
         import random
         from moviepy.video.VideoClip import VideoClip
         
-        def ease_in_out(t):
-            t = max(0, min(1, t/duration))
-            return t * t * (3 - 2 * t)
+        ease_in_out = self._make_ease_in_out(duration)
         
         # Define possible effects
         effects = [
@@ -271,7 +580,7 @@ class VideoGenerator:
                 'name': 'pan_right',
                 'transform': lambda t: {
                     'scale': 1.0,
-                    'pos_x': -clip.w * 0.1 * ease_in_out(t),
+                    'pos_x': -w * 0.1 * ease_in_out(t),
                     'pos_y': 0,
                     'needs_resize': False
                 }
@@ -281,7 +590,7 @@ class VideoGenerator:
                 'name': 'pan_left',
                 'transform': lambda t: {
                     'scale': 1.0,
-                    'pos_x': clip.w * 0.1 * ease_in_out(t),
+                    'pos_x': w * 0.1 * ease_in_out(t),
                     'pos_y': 0,
                     'needs_resize': False
                 }
@@ -290,27 +599,33 @@ class VideoGenerator:
         
         # Select random effect
         effect = random.choice(effects)
-        print(f"Applying {effect['name']} effect")
+        logger.debug("Applying %s effect", effect['name'])
+        
+        # Index the background array directly instead of going through
+        # clip.get_frame(t) for every output frame
+        base_frame = frame
+        h, w = base_frame.shape[:2]
+        kernels = _numba_kernels()
+        zoom_crop = kernels[0] if kernels else None
         
         def make_frame(t):
-            frame = clip.get_frame(t)
+            frame = base_frame
             params = effect['transform'](t)
             
             # If no transformation needed
             if params['scale'] == 1.0 and params['pos_x'] == 0 and not params['needs_resize']:
                 return frame
             
-            img = Image.fromarray(frame)
-            
             # Handle zoom only if needed
             if params['needs_resize']:
-                new_w = int(clip.w * params['scale'])
-                new_h = int(clip.h * params['scale'])
-                img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+                new_w = int(w * params['scale'])
+                new_h = int(h * params['scale'])
+                if zoom_crop is None:
+                    frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LANCZOS4)
                 
                 # Center the zoomed image
-                x1 = (new_w - clip.w) // 2
-                y1 = (new_h - clip.h) // 2
+                x1 = (new_w - w) // 2
+                y1 = (new_h - h) // 2
             else:
                 x1 = 0
                 y1 = 0
@@ -318,23 +633,26 @@ class VideoGenerator:
             # Apply pan offset
             x1 += int(params['pos_x'])
             y1 += int(params['pos_y'])
-            x2 = x1 + clip.w
-            y2 = y1 + clip.h
+            x2 = x1 + w
+            y2 = y1 + h
             
             # Ensure boundaries
             if params['needs_resize']:
-                x1 = max(0, min(x1, new_w - clip.w))
-                y1 = max(0, min(y1, new_h - clip.h))
-                x2 = min(new_w, x1 + clip.w)
-                y2 = min(new_h, y1 + clip.h)
+                x1 = max(0, min(x1, new_w - w))
+                y1 = max(0, min(y1, new_h - h))
+                x2 = min(new_w, x1 + w)
+                y2 = min(new_h, y1 + h)
             else:
-                x1 = max(0, min(x1, clip.w))
-                y1 = max(0, min(y1, clip.h))
-                x2 = min(clip.w, x1 + clip.w)
-                y2 = min(clip.h, y1 + clip.h)
+                x1 = max(0, min(x1, w))
+                y1 = max(0, min(y1, h))
+                x2 = min(w, x1 + w)
+                y2 = min(h, y1 + h)
             
-            img = img.crop((x1, y1, x2, y2))
-            return np.array(img)
+            if params['needs_resize'] and zoom_crop is not None:
+                # Resample only the visible window in the JIT kernel
+                return zoom_crop(frame, new_w, new_h, x1, y1, w, h)
+            
+            return frame[y1:y2, x1:x2]
         
         new_clip = VideoClip(make_frame, duration=duration)
         new_clip = new_clip.set_duration(duration)
@@ -343,84 +661,196 @@ class VideoGenerator:
         
         return new_clip
 
-    def _create_background_clips(self, image_paths: list[str], durations: list[float]):
-        """Create video clips from image paths with random transitions"""
+    def _load_and_resize(self, image_path) -> np.ndarray:
+        """Decode an image file to an RGB array at exact video dimensions"""
+        img = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError(f"Could not read image: {image_path}")
+        return self._resize_to_frame(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+
+    def _create_background_clips(self, image_paths: list[str], durations: list[float],
+                                 temp_files: list[str], temp_dir: Path = None):
+        """Create video clips from image paths with random transitions.
+        Returns the clips and the memory-mapped (N, H, W, 3) background stack;
+        scratch files are written to temp_dir and appended to temp_files for
+        the caller to remove"""
         if not image_paths:
             raise ValueError("No image paths provided")
-            
+
+        # Decode and resize every image straight into one preallocated
+        # (N, H, W, 3) uint8 stack. It is disk-backed (.npy memmap), so pages
+        # are faulted in lazily instead of every frame staying resident in RAM
+        temp_dir = temp_dir or self.DEFAULT_TEMP_DIR
+        fd, stack_path = tempfile.mkstemp(suffix='.npy', dir=temp_dir)
+        os.close(fd)
+        temp_files.append(stack_path)
+        bg_stack = np.lib.format.open_memmap(
+            stack_path,
+            mode='w+',
+            dtype=np.uint8,
+            shape=(len(image_paths), self.HEIGHT, self.WIDTH, 3)
+        )
+
+        def load_into_stack(i, image_path):
+            try:
+                bg_stack[i] = self._load_and_resize(image_path)
+                return True
+            except Exception as e:
+                logger.warning("Error loading image %d: %s", i + 1, e)
+                return False
+
+        # cv2 decode/resize release the GIL, so threads scale with cores
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            loaded = list(executor.map(load_into_stack, range(len(image_paths)), image_paths))
+        bg_stack.flush()
+
         clips = []
-        for i, (image_path, duration) in enumerate(zip(image_paths, durations)):
+        for i, (is_loaded, duration) in enumerate(zip(loaded, durations)):
+            if not is_loaded:
+                # Create a fallback clip if image processing fails
+                fallback_clip = ColorClip(size=(self.WIDTH, self.HEIGHT), 
+                                        color=(0, 0, 0)).set_duration(duration)
+                clips.append(fallback_clip)
+                continue
+
             try:
-                # Load and process image
-                with Image.open(image_path) as img:
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    # Resize to exact video dimensions
-                    target_size = (self.WIDTH, self.HEIGHT)
-                    img = img.resize(target_size, Image.Resampling.LANCZOS)
-                    # Convert to numpy array
-                    img_array = np.array(img)
+                frame = bg_stack[i]
                 
-                # Create base clip from numpy array
-                base_clip = ImageClip(img_array)
-                base_clip = base_clip.set_duration(duration)
+                # Render the zoom/pan in FFmpeg; fall back to per-frame Python below
+                effect_name = 'zoom_in' if i == 0 else random.choice(self.TRANSITION_EFFECTS)
+                try:
+                    clip = self._render_ffmpeg_transition(
+                        frame, duration, effect_name, temp_files,
+                        temp_dir=temp_dir, fps=self.BACKGROUND_FPS
+                    )
+                    clips.append(clip)
+                    logger.debug("Created clip %d with %s effect (ffmpeg)", i + 1, effect_name)
+                    continue
+                except Exception as e:
+                    logger.warning("FFmpeg transition failed for clip %d, rendering in Python: %s", i + 1, e)
                 
                 # Apply transitions with error handling
                 try:
                     # Apply zoom_in effect for the first image
                     if i == 0:
+                        ease_in_out = self._make_ease_in_out(duration)
                         effect = {
                             'name': 'zoom_in',
-                            'transform': lambda t: {
-                                'scale': 1.0 + (0.15 * self.ease_in_out(t/duration)),
+                            'transform': lambda t, ease_in_out=ease_in_out: {
+                                'scale': 1.0 + (0.15 * ease_in_out(t)),
                                 'pos_x': 0,
                                 'pos_y': 0,
                                 'needs_resize': True
                             }
                         }
-                        clip = self._apply_specific_transition(base_clip, duration, effect)
+                        clip = self._apply_specific_transition(frame, duration, effect)
                     else:
-                        clip = self._apply_random_transitions(base_clip, duration)
+                        clip = self._apply_random_transitions(frame, duration)
+                    clip = self._hold_frames(clip, self.BACKGROUND_FPS)
                 except Exception as e:
-                    print(f"Transition failed for clip {i + 1}, using basic clip: {str(e)}")
-                    clip = base_clip
+                    logger.warning("Transition failed for clip %d, using basic clip: %s", i + 1, e)
+                    clip = ImageClip(frame).set_duration(duration)
                 
                 clips.append(clip)
-                print(f"Successfully created clip {i + 1} with transitions")
+                logger.debug("Created clip %d with transitions", i + 1)
                 
             except Exception as e:
-                print(f"Error creating clip {i + 1}: {str(e)}")
+                logger.warning("Error creating clip %d: %s", i + 1, e)
                 # Create a fallback clip if image processing fails
                 fallback_clip = ColorClip(size=(self.WIDTH, self.HEIGHT), 
                                         color=(0, 0, 0)).set_duration(duration)
                 clips.append(fallback_clip)
                 continue
         
-        return clips
+        return clips, bg_stack
+
+    def _hold_frames(self, clip, fps: int):
+        """Sample clip at fps and repeat each frame until the next sample"""
+        # MoviePy asks for every output frame; snap t to the sampling grid
+        # and memoize, so make_frame runs only once per held frame
+        clip.memoize = True
+        held = clip.fl_time(lambda t: int(t * fps + 1e-6) / fps, keep_duration=True)
+        return held.set_fps(fps)
 
-    def _apply_specific_transition(self, clip, duration, effect):
-        """Apply a specific transition effect to a clip"""
+    def _render_ffmpeg_transition(self, frame: np.ndarray, duration: float, effect_name: str,
+                                  temp_files: list[str], temp_dir: Path = None, fps: int = 30):
+        """Render a zoom/pan transition of one frame with FFmpeg's zoompan filter"""
+        n_frames = max(1, int(round(duration * fps)))
+        
+        # Smoothstep easing over the output frame index `on`
+        p = f"(on/{n_frames})"
+        ease = f"{p}*{p}*(3-2*{p})"
+        center_x = "iw/2-(iw/zoom/2)"
+        center_y = "ih/2-(ih/zoom/2)"
+        zoom, x, y = {
+            'static': ("1", "0", "0"),
+            'zoom_in': (f"1+0.15*{ease}", center_x, center_y),
+            'zoom_out': (f"1.15-0.15*{ease}", center_x, center_y),
+            'pan_right': ("1.1", f"(iw-iw/zoom)*{ease}", center_y),
+            'pan_left': ("1.1", f"(iw-iw/zoom)*(1-{ease})", center_y),
+        }[effect_name]
+        
+        fd, output_path = tempfile.mkstemp(suffix='.mp4', dir=temp_dir or self.DEFAULT_TEMP_DIR)
+        os.close(fd)
+        temp_files.append(output_path)
+        
+        # Feed the already-resized frame once; zoompan emits d frames from it
+        height, width = frame.shape[:2]
+        cmd = [
+            get_setting("FFMPEG_BINARY"), '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{width}x{height}", '-i', '-',
+            '-vf', (
+                f"zoompan=z='{zoom}':x='{x}':y='{y}':d={n_frames}"
+                f":s={self.WIDTH}x{self.HEIGHT}:fps={fps}"
+            ),
+            '-frames:v', str(n_frames),
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '18', '-pix_fmt', 'yuv420p',
+            output_path
+        ]
+        subprocess.run(
+            cmd,
+            input=np.ascontiguousarray(frame).tobytes(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=True
+        )
+        
+        new_clip = VideoFileClip(output_path, audio=False)
+        new_clip = new_clip.set_duration(duration)
+        new_clip = new_clip.fadein(duration * 0.05)
+        new_clip = new_clip.fadeout(duration * 0.05)
+        
+        return new_clip
+
+    def _apply_specific_transition(self, frame, duration, effect):
+        """Apply a specific transition effect to a background frame"""
         from moviepy.video.VideoClip import VideoClip
         
+        # Index the background array directly instead of going through
+        # clip.get_frame(t) for every output frame
+        base_frame = frame
+        h, w = base_frame.shape[:2]
+        kernels = _numba_kernels()
+        zoom_crop = kernels[0] if kernels else None
+        
         def make_frame(t):
-            frame = clip.get_frame(t)
+            frame = base_frame
             params = effect['transform'](t)
             
             # If no transformation needed
             if params['scale'] == 1.0 and params['pos_x'] == 0 and not params['needs_resize']:
                 return frame
             
-            img = Image.fromarray(frame)
-            
             # Handle zoom only if needed
             if params['needs_resize']:
-                new_w = int(clip.w * params['scale'])
-                new_h = int(clip.h * params['scale'])
-                img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+                new_w = int(w * params['scale'])
+                new_h = int(h * params['scale'])
+                if zoom_crop is None:
+                    frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LANCZOS4)
                 
                 # Center the zoomed image
-                x1 = (new_w - clip.w) // 2
-                y1 = (new_h - clip.h) // 2
+                x1 = (new_w - w) // 2
+                y1 = (new_h - h) // 2
             else:
                 x1 = 0
                 y1 = 0
@@ -428,23 +858,26 @@ class VideoGenerator:
             # Apply pan offset
             x1 += int(params['pos_x'])
             y1 += int(params['pos_y'])
-            x2 = x1 + clip.w
-            y2 = y1 + clip.h
+            x2 = x1 + w
+            y2 = y1 + h
             
             # Ensure boundaries
             if params['needs_resize']:
-                x1 = max(0, min(x1, new_w - clip.w))
-                y1 = max(0, min(y1, new_h - clip.h))
-                x2 = min(new_w, x1 + clip.w)
-                y2 = min(new_h, y1 + clip.h)
+                x1 = max(0, min(x1, new_w - w))
+                y1 = max(0, min(y1, new_h - h))
+                x2 = min(new_w, x1 + w)
+                y2 = min(new_h, y1 + h)
             else:
-                x1 = max(0, min(x1, clip.w))
-                y1 = max(0, min(y1, clip.h))
-                x2 = min(clip.w, x1 + clip.w)
-                y2 = min(clip.h, y1 + clip.h)
+                x1 = max(0, min(x1, w))
+                y1 = max(0, min(y1, h))
+                x2 = min(w, x1 + w)
+                y2 = min(h, y1 + h)
+            
+            if params['needs_resize'] and zoom_crop is not None:
+                # Resample only the visible window in the JIT kernel
+                return zoom_crop(frame, new_w, new_h, x1, y1, w, h)
             
-            img = img.crop((x1, y1, x2, y2))
-            return np.array(img)
+            return frame[y1:y2, x1:x2]
         
         new_clip = VideoClip(make_frame, duration=duration)
         new_clip = new_clip.set_duration(duration)
@@ -453,37 +886,76 @@ class VideoGenerator:
         
         return new_clip
 
-    async def get_speech_to_text_segments(self, audio_path: str) -> list[dict]:
-        """Get text segments with precise timings using Whisper speech-to-text"""
-        try:
-            print("Loading Whisper model...")
-            model = whisper.load_model("medium")  # Using medium model for better accuracy
-            
-            # First detect the language
-            print("Detecting language...")
-            audio = whisper.load_audio(audio_path)
-            audio = whisper.pad_or_trim(audio)
-            mel = whisper.log_mel_spectrogram(audio).to(model.device)
-            _, probs = model.detect_language(mel)
-            detected_lang = max(probs, key=probs.get)
-            print(f"Detected language: {detected_lang}")
-            
-            # Set force language based on detection
-            force_language = None
-            if detected_lang == "vi":
-                force_language = "vi"
-            elif detected_lang in ["en", "en-US", "en-GB"]:
-                force_language = "en"
-            
-            print(f"Transcribing audio in {force_language if force_language else 'auto'} mode...")
-            result = model.transcribe(
+    def _get_whisper_model(self) -> "WhisperModel":
+        """Load the Whisper model once and share it across calls"""
+        if self._whisper_model is None:
+            with self._whisper_load_lock:
+                # Re-check: another generation may have loaded it while we waited
+                if self._whisper_model is None:
+                    print("Loading Whisper model...")
+                    from faster_whisper import WhisperModel  # deferred: loads ctranslate2
+                    import ctranslate2  # faster-whisper's backend, no torch needed
+                    device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+                    # Using medium model for better accuracy, quantized for speed
+                    self._whisper_model = WhisperModel(
+                        "medium",
+                        device=device,
+                        compute_type="int8_float16" if device == "cuda" else "int8"
+                    )
+        return self._whisper_model
+
+    def _audio_fingerprint(self, audio_path: str) -> str:
+        """Hash the first MiB of an audio file to recognise re-generated episodes"""
+        with open(audio_path, 'rb') as f:
+            return hashlib.sha1(f.read(1 << 20)).hexdigest()
+
+    def _transcribe(self, audio_path: str, language: Optional[str] = None) -> tuple:
+        """Run Whisper on audio_path and return (segments, info); blocking"""
+        from faster_whisper import BatchedInferencePipeline
+        model = self._get_whisper_model()
+        
+        # Transcribe the 30s windows in parallel batches
+        transcriber = BatchedInferencePipeline(model=model)
+        
+        # Language is detected as part of transcription unless one is given.
+        # Greedy decoding with independent 30s windows: no beam search, no
+        # temperature fallback re-decodes, no cross-window conditioning
+        with self._whisper_lock:
+            segments, info = transcriber.transcribe(
                 audio_path,
+                language=language,
                 word_timestamps=True,
-                language=force_language,
                 task="transcribe",
-                condition_on_previous_text=True,
-                initial_prompt=f"This is a {force_language} language video." if force_language else None
+                vad_filter=True,
+                condition_on_previous_text=False,
+                temperature=0.0,
+                beam_size=1,
+                batch_size=8
             )
+            # Segments are decoded lazily; consume them while holding the lock
+            return list(segments), info
+
+    async def get_speech_to_text_segments(self, audio_path: str, force_language: Optional[str] = None) -> list[dict]:
+        """Get text segments with precise timings using Whisper speech-to-text"""
+        try:
+            # Skip language detection when the caller knows the language or
+            # this audio was already transcribed
+            language = force_language
+            fingerprint = None
+            if language is None:
+                fingerprint = self._audio_fingerprint(audio_path)
+                language = self._language_cache.get(fingerprint)
+            
+            # Model load and inference block for seconds, keep them off the event loop
+            print("Transcribing audio...")
+            result_segments, info = await asyncio.to_thread(self._transcribe, audio_path, language)
+            print(f"Detected language: {info.language}")
+            
+            if fingerprint is not None and fingerprint not in self._language_cache:
+                # Evict the oldest entry (dicts keep insertion order)
+                if len(self._language_cache) >= self.LANGUAGE_CACHE_SIZE:
+                    del self._language_cache[next(iter(self._language_cache))]
+                self._language_cache[fingerprint] = info.language
             
             # Process segments to combine words into phrases
             segments = []
@@ -495,19 +967,19 @@ class VideoGenerator:
             word_count = 0
             
             # Process each word with its timing
-            for segment in result["segments"]:
-                for word_data in segment["words"]:
-                    word = word_data["word"].strip()
+            for segment in result_segments:
+                for word_data in segment.words or []:
+                    word = word_data.word.strip()
                     if not word:
                         continue
                         
                     # Start new segment if needed
                     if current_segment['start'] is None:
-                        current_segment['start'] = word_data["start"]
+                        current_segment['start'] = word_data.start
                     
                     current_segment['words'].append(word)
                     word_count += 1
-                    current_segment['end'] = word_data["end"]
+                    current_segment['end'] = word_data.end
                     
                     # Check if we should create a new segment
                     should_segment = (
@@ -521,7 +993,7 @@ class VideoGenerator:
                         # Join words and clean up spacing
                         text = ' '.join(current_segment['words'])
                         # Clean up spacing around punctuation
-                        text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+                        text = _PUNCT_RE.sub(r'\1', text)
                         # Normalize spaces
                         text = ' '.join(text.split())
                         
@@ -544,7 +1016,7 @@ class VideoGenerator:
             if current_segment['words']:
                 # Clean up final segment
                 text = ' '.join(current_segment['words'])
-                text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+                text = _PUNCT_RE.sub(r'\1', text)
                 text = ' '.join(text.split())
                 
                 segments.append({
@@ -556,13 +1028,17 @@ class VideoGenerator:
             
             # Post-process segments to ensure consistent language
             if segments:
-                # Add small gaps between segments for readability
-                for i in range(len(segments) - 1):
-                    gap = min(0.1, (segments[i+1]['start'] - segments[i]['end']) / 2)
-                    segments[i]['end'] -= gap
-                    segments[i+1]['start'] += gap
-                    segments[i]['duration'] = segments[i]['end'] - segments[i]['start']
-                    segments[i+1]['duration'] = segments[i+1]['end'] - segments[i+1]['start']
+                # Add small gaps between segments for readability. Each gap only
+                # depends on the original boundaries, so do them all at once
+                starts = np.fromiter((seg['start'] for seg in segments), dtype=np.float64, count=len(segments))
+                ends = np.fromiter((seg['end'] for seg in segments), dtype=np.float64, count=len(segments))
+                gaps = np.minimum(0.1, (starts[1:] - ends[:-1]) / 2)
+                ends[:-1] -= gaps
+                starts[1:] += gaps
+                for seg, start, end in zip(segments, starts.tolist(), ends.tolist()):
+                    seg['start'] = start
+                    seg['end'] = end
+                    seg['duration'] = end - start
             
             return segments
             
@@ -582,7 +1058,17 @@ class VideoGenerator:
         thumbnail_dir: str = None,
         temp_dir: str = None
     ) -> Dict[str, str]:
+        # Scratch files of this render only: the generator is shared by
+        # concurrent requests, so each call removes just its own
+        temp_files = []
+        # Background clips can hold an ffmpeg reader each (VideoFileClip);
+        # closing the composite doesn't close them
+        background_clips = []
         try:
+            # Start each video with a fresh text background cache
+            self._text_bg_cache.clear()
+            bg_stack = None
+            
             # Use provided directories or defaults
             video_dir = Path(output_dir) if output_dir else self.DEFAULT_VIDEO_DIR
             thumbnail_dir = Path(thumbnail_dir) if thumbnail_dir else self.DEFAULT_THUMBNAIL_DIR
@@ -596,7 +1082,6 @@ class VideoGenerator:
             # Set output paths
             video_path = video_dir / f"{filename}.mp4"
             thumbnail_path = thumbnail_dir / f"{filename}_thumb.jpg"
-            temp_audio_path = temp_dir / "temp-audio.m4a"
             
             # Load and preprocess audio
             print("Loading and preprocessing audio...")
@@ -628,7 +1113,9 @@ class VideoGenerator:
                 # Create background clips from image paths
                 print("\nCreating background clips...")
                 print(f"Using provided background images... (count: {len(background_images)})")
-                background_clips = self._create_background_clips(background_images, durations)
+                background_clips, bg_stack = self._create_background_clips(
+                    background_images, durations, temp_files, temp_dir
+                )
                 if not background_clips:
                     raise ValueError("Failed to create background clips")
                 
@@ -649,22 +1136,37 @@ class VideoGenerator:
             print("\nCreating title clip...")
             title_clip = self.create_title_clip(content['title'], self.DURATION)  # Show title for entire video
             if title_clip:
-                # Position title at the top of the video
-                title_clip = title_clip.set_position(('center', self.HEIGHT // 6))  # 1/5 from top
+                # create_title_clip already positions the title 1/6 from the
+                # top, floating gently around it
                 text_clips.append(title_clip)
                 print(f"Added title clip: {content['title']} (duration: {self.DURATION}s)")
             
-            # Add subtitle clips
-            print("\nCreating subtitle clips...")
-            for timing in phrase_timings:
-                clip = self.create_text_clip(
-                    timing['word'],
-                    start_time=timing['start'],
-                    duration=timing['duration']
-                )
-                if clip:
-                    text_clips.append(clip)
-                    print(f"Added subtitle clip for: {timing['word']}")
+            # Burn subtitles in with libass during the final encode when
+            # possible, instead of compositing one clip per phrase
+            ass_path = None
+            if self._ass_supported:
+                try:
+                    fd, ass_path = tempfile.mkstemp(suffix='.ass', dir=temp_dir)
+                    os.close(fd)
+                    temp_files.append(ass_path)
+                    self._write_ass(phrase_timings, ass_path)
+                    print(f"\nWrote {len(phrase_timings)} subtitles to: {ass_path}")
+                except Exception as e:
+                    print(f"Error writing ASS subtitles, using subtitle clips: {str(e)}")
+                    ass_path = None
+
+            if ass_path is None:
+                # Add subtitle clips
+                print("\nCreating subtitle clips...")
+                for timing in phrase_timings:
+                    clip = self.create_text_clip(
+                        timing['word'],
+                        start_time=timing['start'],
+                        duration=timing['duration']
+                    )
+                    if clip:
+                        text_clips.append(clip)
+                        logger.debug("Added subtitle clip for: %s", timing['word'])
 
             print(f"\nCreated {len(text_clips)} text clips (including title)")
             
@@ -676,50 +1178,62 @@ class VideoGenerator:
             final = CompositeVideoClip(clips, size=(self.WIDTH, self.HEIGHT))
             final = final.set_duration(self.DURATION)
             
-            # Write audio to temporary file first
-            print("\nPreprocessing audio...")
-            audio.write_audiofile(
-                str(temp_audio_path),
-                fps=44100,
-                nbytes=4,
-                codec='aac',
-                bitrate='192k',
-                ffmpeg_params=["-strict", "-2"]
-            )
-            
-            # Load preprocessed audio
-            processed_audio = AudioFileClip(str(temp_audio_path))
-            final = final.set_audio(processed_audio)
+            # Reuse the already-open audio reader; write_videofile encodes it to AAC
+            final = final.set_audio(audio)
+
+            # AAC sources are muxed as-is (MoviePy passes a filename through
+            # with -acodec copy) instead of being decoded and re-encoded
+            copy_audio = Path(audio_path).suffix.lower() in {'.m4a', '.aac', '.mp4'}
 
             # Write final video
             print(f"\nWriting video to: {video_path}")
+            # Slideshow content has no scene cuts, so a long GOP costs nothing
+            ffmpeg_params = ['-maxrate', '10M', '-bufsize', '16M', '-g', '300']
+            if copy_audio:
+                ffmpeg_params += ['-shortest']
+            if ass_path:
+                # ':' separates filter options, so escape it in the path
+                escaped = Path(ass_path).as_posix().replace(':', '\\:')
+                ffmpeg_params += ['-vf', f"ass={escaped}"]
+            if self._h264_codec == 'libx264':
+                # Slow zooms over still images: skip motion/partition search
+                preset = 'ultrafast'
+                ffmpeg_params += ['-tune', 'stillimage']
+            else:
+                # Hardware encoders reject x264 preset names other than MoviePy's default
+                preset = 'medium'
+                # MoviePy only sets yuv420p for libx264; keep output player-friendly
+                ffmpeg_params += ['-pix_fmt', 'yuv420p']
             final.write_videofile(
                 str(video_path),
                 fps=30,
-                codec='libx264',
+                codec=self._h264_codec,
+                preset=preset,
+                audio=str(audio_path) if copy_audio else True,
                 audio_codec='aac',
                 audio_bitrate='192k',
                 bitrate='8000k',
                 threads=2,
-                logger=MyBarLogger(progress_callback)
+                ffmpeg_params=ffmpeg_params,
+                # No progress consumer: skip proglog's per-frame bookkeeping
+                logger=MyBarLogger(progress_callback) if progress_callback else None
             )
             
-            # Clean up
-            audio.close()
-            processed_audio.close()
-            final.close()
-            if os.path.exists(temp_audio_path):
-                os.remove(temp_audio_path)
-            
-            # Generate thumbnail from the first frame
+            # Generate thumbnail from the first background image already in
+            # memory (the composed frame at t=0 is still mid fade-in)
             print("\nGenerating thumbnail...")
-            video_clip = VideoFileClip(str(video_path))
-            thumbnail = video_clip.get_frame(0)  # Get first frame
+            if bg_stack is not None and len(bg_stack):
+                thumbnail = np.asarray(bg_stack[0])
+            else:
+                thumbnail = background.get_frame(0)
             thumbnail_img = Image.fromarray(np.uint8(thumbnail))
-            thumbnail_img.save(str(thumbnail_path), quality=95)
-            video_clip.close()
+            thumbnail_img.save(str(thumbnail_path), quality=95, optimize=True)
             print(f"Thumbnail saved to: {thumbnail_path}")
             
+            # Clean up
+            audio.close()
+            final.close()
+            
             return {
                 'video_path': str(video_path),
                 'thumbnail_path': str(thumbnail_path)
@@ -729,6 +1243,18 @@ class VideoGenerator:
             print(f"Error generating video: {str(e)}")
             traceback.print_exc()
             raise
+        finally:
+            # Stop the readers before removing the files they read from
+            for clip in background_clips:
+                try:
+                    clip.close()
+                except Exception:
+                    pass
+            for temp_path in temp_files:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
 
     def set_format(self, format_type: str):
         """Set the video format and update dimensions"""
@@ -758,54 +1284,68 @@ class VideoGenerator:
         )
         
         # Create solid color background
-        bg = ColorClip(
-            size=(text_clip.w + 60, text_clip.h + 60),
-            color=(0, 0, 50)
-        ).set_opacity(0.8)
+        bg = self._get_text_background(text_clip.w + 60, text_clip.h + 60, (0, 0, 50), 0.8)
         
-        # Add glow effect without resize
-        glow = text_clip.copy()
-        glow = glow.set_opacity(0.4)
+        # Add glow effect: blur the rendered text and its alpha once into a
+        # single RGBA layer instead of stacking several text copies
+        text_rgba = np.dstack([
+            text_clip.get_frame(0).astype(np.uint8),
+            (text_clip.mask.get_frame(0) * 255).astype(np.uint8)
+        ])
+        glow_arr = np.asarray(
+            Image.fromarray(text_rgba, 'RGBA').filter(ImageFilter.GaussianBlur(radius=6))
+        )
+        glow = ImageClip(glow_arr)  # alpha channel becomes the clip mask
+        glow = glow.set_opacity(0.5)
         
         # Calculate center position
         center_pos = ('center', 'center')
         
-        # Create glow positions using lambda functions for offset
-        def offset_position(x_offset=0, y_offset=0):
-            return lambda t: (
-                'center',
-                'center' if y_offset == 0 else self.HEIGHT//2 + y_offset
-            )
-        
-        # Composite with animations - layer multiple glows with different offsets
+        # Composite with animations
         final_clip = CompositeVideoClip([
             bg.set_position(center_pos),
-            glow.set_position(offset_position(y_offset=-2)),  # Up
-            glow.set_position(offset_position(y_offset=2)),   # Down
-            glow.set_position(offset_position()),             # Center
+            glow.set_position(center_pos),
             text_clip.set_position(center_pos)
         ])
         
+        # Every layer is static: flatten them once into a single image + mask
+        # so the title is one layer per frame instead of a nested composite
+        final_clip = ImageClip(final_clip.get_frame(0)).set_mask(
+            ImageClip(final_clip.mask.get_frame(0), ismask=True)
+        )
+        
         # Add title-specific animations
         final_clip = final_clip.set_duration(duration)
         final_clip = final_clip.fadein(1.0)
         final_clip = final_clip.fadeout(1.0)
         
-        # Update floating effect position to 1/6 from top
+        # Update floating effect position to 1/6 from top: a 4s sine, sampled
+        # once per 30 fps output frame
         float_amount = 8
+        fps = 30
+        omega = math.tau / 4
+        ys = (self.HEIGHT / 6 + float_amount * np.sin(omega * np.arange(int(duration * fps) + 1) / fps)).tolist()
+        last = len(ys) - 1
         final_clip = final_clip.set_position(
-            lambda t: ('center', self.HEIGHT * 1/6 + float_amount * math.sin(2 * math.pi * t / 4))
+            lambda t: ('center', ys[min(last, max(0, round(t * fps)))])
         )
         
         return final_clip
 
+    async def _create_chat_completion(self, **kwargs):
+        """Run one chat completion on a client that is closed afterwards"""
+        # app.py runs each request on its own event loop and an async
+        # connection pool can't outlive its loop, so clients aren't cached
+        async with openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")) as client:
+            return await client.chat.completions.create(**kwargs)
+
     async def generate_prompts_with_openai(self, script: str) -> List[str]:
         video_format = self.current_format
         """Generate image prompts using OpenAI"""
         try:
             prompt_count = "9-10" if video_format == "shorts" else "18-20"
             
-            response = await openai.AsyncOpenAI().chat.completions.create(
+            response = await self._create_chat_completion(
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -830,6 +1370,9 @@ class VideoGenerator:
                         "Low angle shot of SpaceX rocket launch, golden hour lighting, lens flare, dramatic clouds"
                         "Wide angle tracking shot of Tesla factory, diffused industrial lighting, steady cam movement"
                         "Close up portrait of Elon Musk, shallow depth of field, natural window lighting, office setting"
+                        
+                        Respond with a JSON object only, in script order:
+                        {"prompts": [{"scene_index": 0, "text": "..."}, {"scene_index": 1, "text": "..."}]}
                         """
                     },
                     {
@@ -847,21 +1390,20 @@ class VideoGenerator:
                         - No timestamps or descriptions, just the prompts
                         """
                     }
-                ]
+                ],
+                response_format={"type": "json_object"}
             )
             
-            # Parse prompts from response
-            prompts_text = response.choices[0].message.content
-            prompts = []
-            
-            # Clean and filter prompts
-            for line in prompts_text.split('\n'):
-                line = line.strip()
-                # Remove numbering, timestamps, or other prefixes
-                line = re.sub(r'^[\d\-\.\s]*|^\*+\s*|^prompt:?\s*', '', line, flags=re.IGNORECASE)
-                
-                if line and len(line) > 10:  # Ensure meaningful content
-                    prompts.append(line)
+            # Parse the structured prompts, ordered by scene
+            scenes = json.loads(response.choices[0].message.content).get('prompts', [])
+            scenes = sorted(
+                (scene for scene in scenes if isinstance(scene, dict)),
+                key=lambda scene: scene.get('scene_index', 0)
+            )
+            prompts = [
+                text for text in (str(scene.get('text', '')).strip() for scene in scenes)
+                if len(text) > 10
+            ]
             
             # Ensure we have at least one prompt
             if not prompts:
@@ -873,9 +1415,9 @@ class VideoGenerator:
                     "Smooth transitions of cool tones with floating particles"
                 ]
             
-            print("🎨 Generated prompts:")
+            print(f"🎨 Generated {len(prompts)} prompts")
             for i, prompt in enumerate(prompts, 1):
-                print(f"{i}. {prompt}")
+                logger.debug("%d. %s", i, prompt)
             
             return prompts
 
@@ -890,31 +1432,61 @@ class VideoGenerator:
                 "Smooth transitions of cool tones with floating particles"
             ]
 
+    def _load_audio(self, audio_path: str) -> tuple:
+        """Decode audio once and reuse it while the file is unchanged"""
+        key = (audio_path, os.path.getmtime(audio_path))
+        cached = self._audio_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        import librosa  # deferred: heavy import, only needed for waveform analysis
+        
+        # Keep the native sample rate (no resample pass) and decode to float32
+        y, sr = librosa.load(audio_path, sr=None, mono=True, dtype=np.float32)
+        cached = (y, sr, len(y) / sr)
+        
+        # Evict the oldest entry (dicts keep insertion order)
+        if len(self._audio_cache) >= self.AUDIO_CACHE_SIZE:
+            del self._audio_cache[next(iter(self._audio_cache))]
+        self._audio_cache[key] = cached
+        return cached
+
     async def analyze_audio_waveform(self, audio_path: str) -> list[dict]:
         """Analyze audio waveform to detect speech segments using multiple features"""
         try:
+            import librosa  # deferred: heavy import (numba, scipy, audioread)
+            
             # Load the audio file
-            y, sr = librosa.load(audio_path)
+            y, sr, duration = self._load_audio(audio_path)
+            
+            # Compute the one spectrogram this function needs. float32 input keeps
+            # the underlying STFT in complex64, and power=2.0 takes |Z|^2 directly
+            # (no sqrt) since onset strength works on dB power anyway
+            S_mel = librosa.feature.melspectrogram(
+                y=np.ascontiguousarray(y, dtype=np.float32),
+                sr=sr,
+                hop_length=512,
+                power=2.0
+            )
             
             # Get onset strength with adjusted parameters
             onset_env = librosa.onset.onset_strength(
-                y=y, 
+                S=librosa.power_to_db(S_mel),
                 sr=sr,
                 hop_length=512,  # Smaller hop length for better precision
                 aggregate=np.median  # Use median for more stable detection
             )
             
             # Get speech probability using RMS energy
-            S = np.abs(librosa.stft(y))
-            rms = librosa.feature.rms(S=S)[0]
-            rms_times = librosa.times_like(rms, sr=sr)
-            
-            # Normalize RMS
-            rms = (rms - rms.min()) / (rms.max() - rms.min())
+            rms = _fast_rms(y, frame=2048, hop=512)
+            rms_times = librosa.frames_to_time(np.arange(len(rms)), sr=sr, hop_length=512)
             
-            # Get pitch information
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            pitch_times = librosa.times_like(pitches)
+            # Normalize RMS in place (float32, no temporaries)
+            rms = np.ascontiguousarray(rms, dtype=np.float32)
+            rms_min = rms.min()
+            rms_range = float(rms.max() - rms_min) or 1.0
+            np.subtract(rms, rms_min, out=rms)
+            np.multiply(rms, 1.0 / rms_range, out=rms)
             
             # Detect speech onsets with adjusted parameters
             onset_frames = librosa.onset.onset_detect(
@@ -926,48 +1498,37 @@ class VideoGenerator:
                 pre_max=0.05,   # Time for local max search
                 post_max=0.05,  # Time for local max search
                 delta=0.07,     # Minimum onset strength threshold
-                backtrack=True  # Find precise onset times
+                hop_length=512,
+                backtrack=True, # Roll onsets back to the preceding RMS energy minimum
+                energy=rms
             )
             
             # Convert frames to time
-            onset_times = librosa.frames_to_time(onset_frames, sr=sr)
+            onset_times = librosa.frames_to_time(onset_frames, sr=sr, hop_length=512)
             
-            # Get audio duration
-            duration = librosa.get_duration(y=y, sr=sr)
+            # Map every onset segment to its [start, end] RMS frame range at once
+            # (RMS times are sorted, so a binary search replaces per-segment masks)
+            segment_ends = np.append(onset_times[1:], duration)
+            start_idxs = np.searchsorted(rms_times, onset_times, side='left')
+            end_idxs = np.searchsorted(rms_times, segment_ends, side='right')
+            rms_cumsum = np.concatenate(([0.0], np.cumsum(rms, dtype=np.float64)))
             
             # Create segments considering both onsets and RMS energy
             segments = []
-            for i in range(len(onset_times)):
-                start = onset_times[i]
-                # If it's the last onset, use audio duration as end
-                end = duration if i == len(onset_times) - 1 else onset_times[i + 1]
-                
+            for start, end, seg_start, seg_end in zip(onset_times, segment_ends, start_idxs, end_idxs):
                 # Get RMS energy for this segment
-                segment_rms = rms[(rms_times >= start) & (rms_times <= end)]
-                avg_energy = np.mean(segment_rms) if len(segment_rms) > 0 else 0
+                count = seg_end - seg_start
+                avg_energy = (rms_cumsum[seg_end] - rms_cumsum[seg_start]) / count if count > 0 else 0
                 
-                # Only add segments with significant energy and minimum duration
+                # Only add segments with significant energy and minimum duration;
+                # boundaries are already backtracked by onset_detect
                 if avg_energy > 0.2 and (end - start) >= 0.15:
-                    # Adjust segment boundaries based on energy
-                    start_idx = np.where(rms_times >= start)[0][0]
-                    end_idx = np.where(rms_times <= end)[0][-1]
-                    
-                    # Find the actual speech start/end within the segment
-                    while start_idx < len(rms) and rms[start_idx] < 0.2:
-                        start_idx += 1
-                    while end_idx > 0 and rms[end_idx] < 0.2:
-                        end_idx -= 1
-                    
-                    actual_start = rms_times[start_idx]
-                    actual_end = rms_times[end_idx]
-                    
-                    if actual_end - actual_start >= 0.15:  # Minimum segment duration
-                        segments.append({
-                            'start': actual_start,
-                            'end': actual_end,
-                            'duration': actual_end - actual_start,
-                            'energy': float(avg_energy)
-                        })
+                    segments.append({
+                        'start': float(start),
+                        'end': float(end),
+                        'duration': float(end - start),
+                        'energy': float(avg_energy)
+                    })
             
             return segments
             
@@ -983,9 +1544,15 @@ class VideoGenerator:
             if not phrases:
                 return self._get_fallback_timings(subtitle_text)
             
-            # Load audio for duration
-            y, sr = librosa.load(audio_path)
-            total_duration = librosa.get_duration(y=y, sr=sr)
+            # Read duration from the file header instead of decoding the audio
+            try:
+                info = sf.info(audio_path)
+                total_duration = info.frames / info.samplerate
+            except RuntimeError:
+                # Format libsndfile can't open (e.g. MP3 on libsndfile < 1.1):
+                # librosa falls back to audioread's container duration
+                import librosa
+                total_duration = librosa.get_duration(path=audio_path)
             
             # Timing parameters - adjusted for better sync
             SPEED_FACTOR = 1.0  # Normal speed (was 0.95)
@@ -993,52 +1560,46 @@ class VideoGenerator:
             MIN_PHRASE_DURATION = 1.5  # Slightly reduced minimum duration (was 1.8)
             GAP_DURATION = 0.15  # Slightly reduced gap (was 0.2)
             
+            # Per-phrase word counts and trailing punctuation, computed once.
+            # split_into_phrases normalizes whitespace, so words are single-space
+            # separated and no per-phrase split()/strip() copies are needed
+            word_counts = np.fromiter((phrase.count(' ') + 1 for phrase in phrases), dtype=np.float64, count=len(phrases))
+            endings = [phrase[-1] for phrase in phrases]
+            
             # Count total words and calculate average time per word
-            total_words = sum(len(phrase.split()) for phrase in phrases)
+            total_words = word_counts.sum()
             available_duration = total_duration - (len(phrases) * GAP_DURATION)
             avg_time_per_word = (available_duration * SPEED_FACTOR) / total_words
             
             # Use the larger of calculated or base duration for more natural pacing
             word_duration = max(avg_time_per_word, BASE_WORD_DURATION)
             
-            # Generate timings with a minimal initial delay
-            timings = []
-            current_time = 0.05  # Reduced initial delay (was 0.1)
+            # Calculate base duration from words, adding extra time for punctuation
+            punct_bonus = np.where(
+                np.isin(endings, ['.', '!', '?']), 0.3,  # Reduced end of sentence pause (was 0.4)
+                np.where(np.isin(endings, [',', ';', ':']), 0.2, 0.0)  # Reduced mid-sentence pause (was 0.3)
+            )
+            base_durations = word_counts * word_duration + punct_bonus
             
-            for phrase in phrases:
-                # Calculate base duration from words
-                words = len(phrase.split())
-                base_duration = words * word_duration
-                
-                # Add extra time for punctuation
-                if phrase.strip().endswith(('.', '!', '?')):
-                    base_duration += 0.3  # Reduced end of sentence pause (was 0.4)
-                elif phrase.strip().endswith((',', ';', ':')):
-                    base_duration += 0.2  # Reduced mid-sentence pause (was 0.3)
-                
-                # Ensure minimum duration with some variability
-                min_duration = max(MIN_PHRASE_DURATION, words * 0.25)  # Reduced word-based minimum (was 0.3)
-                duration = max(base_duration, min_duration)
-                
-                # Create timing entry
-                timing = {
-                    'word': phrase,
-                    'start': current_time,
-                    'end': current_time + duration,
-                    'duration': duration
-                }
-                timings.append(timing)
-                
-                # Update current time with gap
-                current_time += duration + GAP_DURATION
+            # Ensure minimum duration with some variability
+            min_durations = np.maximum(MIN_PHRASE_DURATION, word_counts * 0.25)  # Reduced word-based minimum (was 0.3)
+            durations = np.maximum(base_durations, min_durations)
+            
+            # Lay phrases out back to back with a gap, after a minimal initial delay
+            elapsed = np.cumsum(durations + GAP_DURATION)
+            starts = 0.05 + np.concatenate(([0.0], elapsed[:-1]))  # Reduced initial delay (was 0.1)
+            current_time = 0.05 + elapsed[-1]
         
             # If we're over total duration, scale back proportionally
             if current_time > total_duration:
                 scale_factor = (total_duration - 0.1) / current_time  # Reduced end buffer (was 0.2)
-                for timing in timings:
-                    timing['start'] *= scale_factor
-                    timing['end'] *= scale_factor
-                    timing['duration'] *= scale_factor
+                starts *= scale_factor
+                durations *= scale_factor
+            
+            timings = [
+                {'word': phrase, 'start': start, 'end': start + duration, 'duration': duration}
+                for phrase, start, duration in zip(phrases, starts.tolist(), durations.tolist())
+            ]
         
             # Apply timing adjustments for better sync
             adjusted_timings = self._adjust_timing_gaps(timings)
@@ -1061,84 +1622,74 @@ class VideoGenerator:
             min_duration = 1.2 * SPEED_FACTOR
             gap_duration = 0.08 * SPEED_FACTOR
             
-            timings = []
-            current_time = 0.0
+            # Phrases are whitespace-normalized: count separators instead of splitting
+            word_counts = np.fromiter((phrase.count(' ') + 1 for phrase in phrases), dtype=np.float64, count=len(phrases))
+            endings = [phrase[-1] for phrase in phrases]
             
-            for phrase in phrases:
-                words = len(phrase.split())
-                duration = max(words * word_duration, min_duration)
-                
-                if phrase.strip().endswith(('.', '!', '?')):
-                    duration += 0.2 * SPEED_FACTOR
-                elif phrase.strip().endswith((',', ';', ':')):
-                    duration += 0.1 * SPEED_FACTOR
-                
-                timing = {
-                    'word': phrase,
-                    'start': current_time,
-                    'end': current_time + duration,
-                    'duration': duration
-                }
-                timings.append(timing)
-                
-                current_time += duration + gap_duration
+            durations = np.maximum(word_counts * word_duration, min_duration)
+            durations += np.where(
+                np.isin(endings, ['.', '!', '?']), 0.2 * SPEED_FACTOR,
+                np.where(np.isin(endings, [',', ';', ':']), 0.1 * SPEED_FACTOR, 0.0)
+            )
+            starts = np.concatenate(([0.0], np.cumsum(durations + gap_duration)[:-1]))
             
-            return timings
+            return [
+                {'word': phrase, 'start': start, 'end': start + duration, 'duration': duration}
+                for phrase, start, duration in zip(phrases, starts.tolist(), durations.tolist())
+            ]
             
         except Exception as e:
             print(f"Error in fallback timing: {str(e)}")
             return []
 
+    def _resize_to_frame(self, arr: np.ndarray) -> np.ndarray:
+        """Resize an RGB array to the video dimensions with OpenCV"""
+        h, w = arr.shape[:2]
+        if (w, h) == (self.WIDTH, self.HEIGHT):
+            return arr
+        # Area averaging for downscales, Lanczos for upscales
+        upscale = self.WIDTH * self.HEIGHT > w * h
+        interpolation = cv2.INTER_LANCZOS4 if upscale else cv2.INTER_AREA
+        return cv2.resize(arr, (self.WIDTH, self.HEIGHT), interpolation=interpolation)
+
     def _ensure_numpy_array(self, img):
         """Convert any image type to a numpy array with correct dimensions"""
         try:
-            # If it's already a numpy array, just return it
+            # Numpy arrays only need resizing (a no-op at video dimensions)
             if isinstance(img, np.ndarray):
-                return img
+                return self._resize_to_frame(img)
             
             # If it's a PIL Image (including JpegImageFile)
             if hasattr(img, 'convert') and hasattr(img, 'resize'):
-                # Ensure RGB mode
+                # Ensure RGB mode and convert to numpy array
                 if img.mode != 'RGB':
                     img = img.convert('RGB')
-                # Resize to video dimensions using LANCZOS resampling
-                img = img.resize((self.WIDTH, self.HEIGHT), Image.Resampling.LANCZOS)
-                # Convert to numpy array
-                return np.array(img)
+                # Resize to video dimensions
+                return self._resize_to_frame(np.asarray(img))
             
             raise ValueError(f"Unsupported image type: {type(img)}")
         except Exception as e:
             print(f"Error converting image to numpy array: {e}")
             return None
 
-    def _process_image_response(self, response):
+    async def _process_image_response(self, response):
+        """Decode an image response in a worker thread, off the event loop"""
+        # cv2 decode and resize release the GIL, so concurrent
+        # responses decode in parallel on the default executor
+        return await asyncio.to_thread(self._process_image_response_sync, response)
+
+    def _process_image_response_sync(self, response):
         """Helper method to process image response"""
-        import base64
-        import io
-        import numpy as np
-        
         try:
             image_data = base64.b64decode(response.data[0].b64_json)
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convert image array to PIL Image with proper type handling
-            if isinstance(image, np.ndarray):
-                # Ensure array is in uint8 format
-                if image.dtype != np.uint8:
-                    image = (image * 255).astype(np.uint8)
-                # Handle both RGB and RGBA images
-                if len(image.shape) == 3 and image.shape[2] in [3, 4]:
-                    img = Image.fromarray(image)
-                else:
-                    raise ValueError(f"Invalid image array shape: {image.shape}. Expected (H, W, 3) or (H, W, 4)")
-            else:
-                img = image
-            
-            # Resize using LANCZOS resampling
-            if img.size != (self.WIDTH, self.HEIGHT):
-                img = img.resize((self.WIDTH, self.HEIGHT), Image.Resampling.LANCZOS)
-            
-            return np.array(img)
+            image = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError("Could not decode image data")
+            # Swap channels in place instead of allocating another full frame
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+            
+            # Resize to video dimensions
+            return self._resize_to_frame(image)
         except Exception as e:
             print(f"Error processing image: {str(e)}")
             return np.full((self.HEIGHT, self.WIDTH, 3), [25, 25, 25], dtype=np.uint8)
@@ -1153,11 +1704,8 @@ class VideoGenerator:
 
     def validate_dependencies(self) -> None:
         """Validate that all required dependencies are available"""
+        # Required Python packages (moviepy, PIL) are imported at module load
         try:
-            # Check for required Python packages
-            import moviepy.editor
-            import PIL
-            
             # Check for required directories
             required_dirs = ['contents/video', 'contents/audio', 'contents/temp']
             for dir_path in required_dirs:
@@ -1165,23 +1713,14 @@ class VideoGenerator:
                 
             # Check write permissions
             for dir_path in required_dirs:
-                test_file = os.path.join(dir_path, '.test')
-                try:
-                    with open(test_file, 'w') as f:
-                        f.write('test')
-                    os.remove(test_file)
-                except Exception as e:
-                    raise PermissionError(f"Cannot write to {dir_path}: {str(e)}")
+                if not os.access(dir_path, os.W_OK):
+                    raise PermissionError(f"Cannot write to {dir_path}")
                     
-        except ImportError as e:
-            raise RuntimeError(f"Missing required dependency: {str(e)}")
         except Exception as e:
             raise RuntimeError(f"Validation failed: {str(e)}")
 
     def _align_subtitles_with_timing(self, word_segments: list[dict], subtitle_text: str) -> list[dict]:
         """Align subtitle text with word timings using sequence matching"""
-        from difflib import SequenceMatcher
-        
         # Clean and split subtitle text
         subtitle_words = self._clean_text(subtitle_text).split()
         detected_words = [self._clean_text(seg["word"]) for seg in word_segments]
@@ -1191,44 +1730,69 @@ class VideoGenerator:
         buffer = []
         current_start = None
         
+        # How far ahead of the current subtitle word a detected word may match,
+        # so words Whisper dropped don't stall the alignment
+        LOOKAHEAD = 3
+        
+        # All pairwise similarities in one batched, multithreaded call
+        similarity = None
+        if cdist is not None and detected_words and subtitle_words:
+            similarity = cdist(detected_words, subtitle_words, scorer=fuzz.ratio, workers=-1) / 100.0
+        
         for i, segment in enumerate(word_segments):
             if subtitle_idx >= len(subtitle_words):
                 break
             
-            # Compare words using sequence matcher
-            similarity = SequenceMatcher(
-                None, 
-                self._clean_text(segment["word"]), 
-                subtitle_words[subtitle_idx]
-            ).ratio()
-            
-            if similarity > 0.8:  # High similarity threshold
-                if not current_start:
-                    current_start = segment["start"]
-                buffer.append(subtitle_words[subtitle_idx])
-                
-                # Create phrase segment based on word count, punctuation, or length
-                should_segment = (
-                    len(buffer) >= 9 or  # Target 9-10 words per segment
-                    (len(buffer) >= 7 and subtitle_words[subtitle_idx][-1] in '.!?') or  # End sentence if 7+ words
-                    subtitle_words[subtitle_idx][-1] in '.!?' or  # Always break at end of sentence
-                    (len(buffer) >= 10)  # Force break at 10 words
-                )
-                
-                if should_segment:
-                    aligned_segments.append({
-                        "word": " ".join(buffer),
-                        "start": current_start,
-                        "end": segment["end"],
-                        "duration": segment["end"] - current_start
-                    })
-                    buffer = []
-                    current_start = None
+            # Best match for this detected word within the lookahead window
+            window_end = min(subtitle_idx + LOOKAHEAD, len(subtitle_words))
+            if similarity is not None:
+                scores = similarity[i, subtitle_idx:window_end]
+            else:
+                scores = [
+                    self._word_similarity(detected_words[i], word)
+                    for word in subtitle_words[subtitle_idx:window_end]
+                ]
+            best = int(np.argmax(scores))
+            
+            if scores[best] <= 0.8:  # High similarity threshold
+                # Extra or misheard word: keep waiting for the current subtitle word
+                continue
             
-            subtitle_idx += 1
+            if current_start is None:
+                current_start = segment["start"]
+            # Subtitle words skipped over by the match ride along with it
+            match_idx = subtitle_idx + best
+            buffer.extend(subtitle_words[subtitle_idx:match_idx + 1])
+            subtitle_idx = match_idx + 1
+            last_word = subtitle_words[match_idx]
+            
+            # Create phrase segment based on word count, punctuation, or length
+            should_segment = (
+                len(buffer) >= 9 or  # Target 9-10 words per segment
+                (len(buffer) >= 7 and last_word[-1] in '.!?') or  # End sentence if 7+ words
+                last_word[-1] in '.!?' or  # Always break at end of sentence
+                (len(buffer) >= 10)  # Force break at 10 words
+            )
+            
+            if should_segment:
+                aligned_segments.append({
+                    "word": " ".join(buffer),
+                    "start": current_start,
+                    "end": segment["end"],
+                    "duration": segment["end"] - current_start
+                })
+                buffer = []
+                current_start = None
+        
+        # Detected words ran out: keep the unmatched subtitle tail on screen
+        # with the last phrase instead of dropping it
+        if word_segments and subtitle_idx < len(subtitle_words):
+            buffer.extend(subtitle_words[subtitle_idx:])
+            if current_start is None:
+                current_start = word_segments[-1]["start"]
     
         # Add remaining buffer
-        if buffer and current_start:
+        if buffer and current_start is not None:
             aligned_segments.append({
                 "word": " ".join(buffer),
                 "start": current_start,
@@ -1238,42 +1802,38 @@ class VideoGenerator:
     
         return aligned_segments
 
+    def _word_similarity(self, a: str, b: str) -> float:
+        """Similarity ratio (0-1) between two cleaned words"""
+        if a == b:
+            return 1.0
+        if fuzz is not None:
+            return fuzz.ratio(a, b) / 100.0
+        return SequenceMatcher(None, a, b).ratio()
+
     def _clean_text(self, text: str) -> str:
         """Clean text for comparison"""
-        import re
-        return re.sub(r'[^\w\s]', '', text.lower().strip())
+        return _clean_text_cached(text)
 
     def _adjust_timing_gaps(self, segments: list[dict]) -> list[dict]:
         """Adjust timing gaps between segments for smoother transitions"""
         if not segments:
             return []
-            
-        adjusted_segments = []
-        total_duration = segments[-1]['end'] - segments[0]['start']
         
-        for i, segment in enumerate(segments):
-            if i > 0:
-                # Calculate gap with previous segment
-                gap = segment['start'] - adjusted_segments[-1]['end']
-                
-                if gap > 0.3:  # If gap is too large
-                    # Extend previous segment and start current one earlier
-                    gap_adjustment = gap * 0.4  # Reduce gap by 40%
-                    adjusted_segments[-1]['end'] += gap_adjustment / 2
-                    segment['start'] -= gap_adjustment / 2
-                elif gap < 0:  # If segments overlap
-                    # Find middle point and adjust both segments
-                    middle = (segment['start'] + adjusted_segments[-1]['end']) / 2
-                    adjusted_segments[-1]['end'] = middle
-                    segment['start'] = middle
-            
-            # Ensure minimum duration
-            min_duration = 1.5  # Minimum 1.5 seconds for readability
-            if segment['end'] - segment['start'] < min_duration:
-                segment['end'] = segment['start'] + min_duration
-            
-            # Update duration
-            segment['duration'] = segment['end'] - segment['start']
-            adjusted_segments.append(segment)
+        starts = [s['start'] for s in segments]
+        ends = [s['end'] for s in segments]
+        min_duration = 1.5  # Minimum 1.5 seconds for readability
+        
+        kernels = _numba_kernels()
+        if kernels is not None:
+            starts, ends = np.array(starts, dtype=np.float64), np.array(ends, dtype=np.float64)
+            durations = np.empty_like(starts)
+            kernels[1](starts, ends, durations, min_duration)
+            starts, ends, durations = starts.tolist(), ends.tolist(), durations.tolist()
+        else:
+            durations = [0.0] * len(segments)
+            _adjust_gaps(starts, ends, durations, min_duration)
         
-        return adjusted_segments
\ No newline at end of file
+        return [
+            {**segment, 'start': start, 'end': end, 'duration': duration}
+            for segment, start, end, duration in zip(segments, starts, ends, durations)
+        ]
@@ -1,20 +1,22 @@
 import os
-from openai import OpenAI
+from openai import AsyncOpenAI
 from pathlib import Path
 
 class VoiceGenerator:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # One async client per generator so its connection pool is reused
+        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
     
     async def generate_voice(self, script: str, output_path: str) -> str:
-        response = await self.client.audio.speech.create(
+        audio_path = Path(output_path) / "output.mp3"
+        
+        # Stream the audio to disk as it arrives instead of buffering the
+        # whole response and writing it with a blocking call
+        async with self.client.audio.speech.with_streaming_response.create(
             model="tts-1",
             voice="alloy",  # You can change the voice
             input=script
-        )
-        
-        # Save the audio file
-        audio_path = Path(output_path) / "output.mp3"
-        response.stream_to_file(str(audio_path))
+        ) as response:
+            await response.stream_to_file(str(audio_path))
         
         return str(audio_path) 
\ No newline at end of file
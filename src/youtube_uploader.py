@@ -1,11 +1,24 @@
 import os
+import asyncio
 from typing import Dict, Any, Optional
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
+import google_auth_httplib2
+import httplib2
 import pickle
+import threading
+
+# Service and credentials shared by all uploaders, keyed by the credentials
+# file's mtime so a re-authorization rebuilds them. The service's own httplib2
+# connection is not thread-safe, so uploads send over their own (see
+# _resumable_upload)
+_YT_SERVICE = None
+_YT_CREDENTIALS = None
+_YT_SERVICE_KEY = None
+_YT_SERVICE_LOCK = threading.Lock()
 
 class YouTubeUploader:
     def __init__(self):
@@ -16,15 +29,29 @@ class YouTubeUploader:
         self.api_name = 'youtube'
         self.api_version = 'v3'
         self.client_secrets_file = 'client_secrets.json'
-        self.credentials_pickle = 'youtube_credentials.pickle'
+        self.credentials_file = 'youtube_credentials.json'
+        self.legacy_credentials_file = 'youtube_credentials.pickle'  # older versions
         self.credentials = None
         self._youtube = None
 
+    def _migrate_legacy_credentials(self) -> None:
+        """Move credentials pickled by older versions to the JSON file, once"""
+        # Without this, the saved token would be ignored and the OAuth flow
+        # would wait for a browser that a headless server doesn't have
+        with open(self.legacy_credentials_file, 'rb') as token:
+            credentials = pickle.load(token)
+        with open(self.credentials_file, 'w') as token:
+            token.write(credentials.to_json())
+        os.remove(self.legacy_credentials_file)
+        print(f"Migrated YouTube credentials to {self.credentials_file}")
+
     def _load_credentials(self) -> None:
         """Load or refresh credentials for YouTube API"""
-        if os.path.exists(self.credentials_pickle):
-            with open(self.credentials_pickle, 'rb') as token:
-                self.credentials = pickle.load(token)
+        if not os.path.exists(self.credentials_file) and os.path.exists(self.legacy_credentials_file):
+            self._migrate_legacy_credentials()
+
+        if os.path.exists(self.credentials_file):
+            self.credentials = Credentials.from_authorized_user_file(self.credentials_file, self.scopes)
 
         if not self.credentials or not self.credentials.valid:
             if self.credentials and self.credentials.expired and self.credentials.refresh_token:
@@ -34,18 +61,46 @@ class YouTubeUploader:
                     self.client_secrets_file, self.scopes)
                 self.credentials = flow.run_local_server(port=0)
 
-            with open(self.credentials_pickle, 'wb') as token:
-                pickle.dump(self.credentials, token)
+            with open(self.credentials_file, 'w') as token:
+                token.write(self.credentials.to_json())
+
+    def _resumable_upload(self, upload_request) -> Dict[str, Any]:
+        """Send the upload chunk by chunk until YouTube returns the video resource"""
+        # Runs in a worker thread: use a connection of this upload's own
+        # instead of the shared service's
+        http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+        response = None
+        while response is None:
+            status, response = upload_request.next_chunk(http=http)
+            if status:
+                print(f"Uploaded {int(status.progress() * 100)}%")
+        return response
 
     def _get_youtube_service(self):
         """Get authenticated YouTube service"""
+        global _YT_SERVICE, _YT_SERVICE_KEY, _YT_CREDENTIALS
         if not self._youtube:
-            self._load_credentials()
-            self._youtube = build(
-                self.api_name,
-                self.api_version,
-                credentials=self.credentials
-            )
+            with _YT_SERVICE_LOCK:
+                key = (
+                    os.path.getmtime(self.credentials_file)
+                    if os.path.exists(self.credentials_file) else None
+                )
+                if _YT_SERVICE is None or key is None or key != _YT_SERVICE_KEY:
+                    self._load_credentials()
+                    # Discovery document ships with google-api-python-client:
+                    # no HTTPS discovery fetch and no discovery cache writes
+                    _YT_CREDENTIALS = self.credentials
+                    _YT_SERVICE = build(
+                        self.api_name,
+                        self.api_version,
+                        credentials=self.credentials,
+                        cache_discovery=False,
+                        static_discovery=True
+                    )
+                    # Credentials may have just been written; key on the new file
+                    _YT_SERVICE_KEY = os.path.getmtime(self.credentials_file)
+                self.credentials = _YT_CREDENTIALS
+                self._youtube = _YT_SERVICE
         return self._youtube
 
     async def upload_video(
@@ -99,7 +154,8 @@ class YouTubeUploader:
             media = MediaFileUpload(
                 video_path,
                 mimetype='video/*',
-                resumable=True
+                resumable=True,
+                chunksize=8 * 1024 * 1024  # bounded retries/memory per request, progress per chunk
             )
 
             # Execute upload request
@@ -109,8 +165,8 @@ class YouTubeUploader:
                 media_body=media
             )
 
-            # Upload the video
-            response = upload_request.execute()
+            # Upload the video in a worker thread so the event loop stays free
+            response = await asyncio.to_thread(self._resumable_upload, upload_request)
 
             # Prepare response data
             video_id = response['id']